@@ -304,8 +304,7 @@ async def resolve_course_by_code(
 ):
     """Resolve a course code into course unit realisation snapshots"""
     try:
-        course_api = AaltoCourseApiClient()
-        try:
+        with AaltoCourseApiClient() as course_api:
             dr = DateRange(
                 start=date.fromisoformat(from_date),
                 end=date.fromisoformat(to_date),
@@ -317,8 +316,6 @@ async def resolve_course_by_code(
                 date_range=dr,
                 limit_realisations=(None if limit_realisations == 0 else limit_realisations),
             )
-        finally:
-            course_api.close()
     except SisuTimeoutError as e:
         logger.error("Sisu API timeout: %s", e)
         raise HTTPException(status_code=504, detail="Sisu API timeout") from e
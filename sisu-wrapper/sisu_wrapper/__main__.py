@@ -2,32 +2,100 @@ import argparse
 import json
 import logging
 import os
+from contextlib import nullcontext
 from datetime import date
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set, TextIO, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup, installed via the "fast" extra
+    orjson = None
 
 from .client import SisuClient
 from .aalto_api_client import AaltoCourseApiClient
-from .historical import DateRange, read_course_unit_ids_from_courses_json, extract_historical_realisation_ids_for_course_unit
+from .cache import SqliteCache
+from .historical import (
+    DateRange,
+    read_course_units_from_courses_json,
+    extract_historical_realisation_ids_for_assessment_items,
+    extract_historical_realisation_ids_for_course_unit,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_PATH = "~/.cache/sisu-wrapper/realisations.sqlite3"
+REALISATIONS_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Both accept bytes, so JSONL can be scanned without text decoding
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def checkpoint_log_path(state_path: str) -> str:
+    return state_path + ".log"
+
+def read_last_checkpoint(log_path: str) -> Dict[str, Any] | None:
+    """Return the newest complete entry of the checkpoint log, if any"""
+    with open(log_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        tail = f.read()
+    for line in reversed(tail.splitlines()):
+        try:
+            state = json.loads(line)
+        except ValueError:
+            # Torn write from an interrupted run, or a line cut by the seek
+            continue
+        if isinstance(state, dict):
+            return state
+    return None
 
 def load_state(state_path: str) -> Dict[str, Any]:
+    log_path = checkpoint_log_path(state_path)
+    if os.path.exists(log_path):
+        state = read_last_checkpoint(log_path)
+        if state is not None:
+            return state
     if not os.path.exists(state_path):
         return {}
     with open(state_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def append_checkpoint(f: TextIO, state: Dict[str, Any]) -> None:
+    f.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+    f.write("\n")
+    f.flush()
+
 def save_state(state_path: str, state: Dict[str, Any]) -> None:
+    """Write the canonical state file and drop the log it supersedes"""
     tmp = state_path + ".tmp"
     with open(tmp, "w", encoding="utf-8") as f:
         json.dump(state, f, ensure_ascii=False, indent=2)
     os.replace(tmp, state_path)
 
-def append_jsonl(path: str, obj: Dict[str, Any]) -> None:
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    log_path = checkpoint_log_path(state_path)
+    if os.path.exists(log_path):
+        os.remove(log_path)
+
+def load_written_realisation_ids(path: str) -> Set[Tuple[Any, str]]:
+    """Collect (courseUnitId, CUR id) pairs already in the JSONL output (for resume)"""
+    seen: Set[Tuple[Any, str]] = set()
+    if not os.path.exists(path):
+        return seen
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                rec = _loads(line)
+            except ValueError:
+                # A partially written trailing line from an interrupted run
+                continue
+            if isinstance(rec, dict) and isinstance(rec.get("id"), str):
+                seen.add((rec.get("courseUnitId"), rec["id"]))
+    return seen
+
+def append_jsonl(f: TextIO, obj: Dict[str, Any]) -> None:
+    f.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+    f.write("\n")
 
 
 def main() -> None:
@@ -41,6 +109,8 @@ def main() -> None:
     p.add_argument("--resume", action="store_true", help="Resume from --state if present")
     p.add_argument("--flush-every", type=int, default=1, help="Write checkpoint every N course units")
     p.add_argument("--limit-course-units", type=int, default=None, help="For testing only")
+    p.add_argument("--cache-path", default=DEFAULT_CACHE_PATH, help="On-disk cache for Sisu realisation lists")
+    p.add_argument("--no-cache", action="store_true", help="Always fetch realisation lists from Sisu")
     args = p.parse_args()
 
     date_range = DateRange(
@@ -48,9 +118,10 @@ def main() -> None:
         end=date.fromisoformat(args.to_date),
     )
 
-    course_unit_ids: List[str] = read_course_unit_ids_from_courses_json(args.courses_json)
+    course_units = read_course_units_from_courses_json(args.courses_json)
     if args.limit_course_units is not None:
-        course_unit_ids = course_unit_ids[: args.limit_course_units]
+        course_units = course_units[: args.limit_course_units]
+    course_unit_ids: List[str] = [cu_id for cu_id, _ in course_units]
 
     state = load_state(args.state) if args.resume else {}
     state_next = state.get("next_index") if isinstance(state.get("next_index"), int) else 0
@@ -66,49 +137,81 @@ def main() -> None:
     logger.info("Writing JSONL to %s", args.out)
     logger.info("Checkpoint file: %s", args.state)
 
+    # (courseUnitId, CUR id) pairs written so far; a CUR shared by several
+    # course units is still written once under each of them
+    seen_cur_ids: Set[Tuple[Any, str]] = load_written_realisation_ids(args.out) if args.resume else set()
+    if seen_cur_ids:
+        logger.info("Skipping %d CURs already in %s", len(seen_cur_ids), args.out)
+
     processed_units = 0
     written_records = 0
-
-    with SisuClient() as sisu:
-        course_api = AaltoCourseApiClient()
+    failed_units = 0
+
+    # Checkpoints are appended to a log and compacted into --state on exit
+    with (
+        (nullcontext() if args.no_cache
+         else SqliteCache(args.cache_path, REALISATIONS_CACHE_TTL)) as cache,
+        SisuClient(persistent_cache=cache) as sisu,
+        AaltoCourseApiClient() as course_api,
+        open(args.out, "a", encoding="utf-8") as out,
+        open(checkpoint_log_path(args.state), "a", encoding="utf-8") as checkpoints,
+    ):
         current_index = start_index
         try:
             for i in range(start_index, len(course_unit_ids)):
                 current_index = i
-                cu_id = course_unit_ids[i]
+                cu_id, assessment_item_ids = course_units[i]
                 logger.info("[%d/%d] courseUnitId=%s", i + 1, len(course_unit_ids), cu_id)
 
                 # Step 1: find historical CUR ids via Sisu
                 try:
-                    cur_ids = extract_historical_realisation_ids_for_course_unit(
-                        sisu=sisu,
-                        course_unit_id=cu_id,
-                        date_range=date_range,
-                    )
+                    if assessment_item_ids:
+                        # courses.json already lists them; skip the course unit fetch
+                        cur_ids = extract_historical_realisation_ids_for_assessment_items(
+                            sisu=sisu,
+                            assessment_item_ids=assessment_item_ids,
+                            date_range=date_range,
+                        )
+                    else:
+                        cur_ids = extract_historical_realisation_ids_for_course_unit(
+                            sisu=sisu,
+                            course_unit_id=cu_id,
+                            date_range=date_range,
+                        )
                 except Exception as e:
-                    logger.exception("Failed extracting CUR ids for %s: %s", cu_id, e)
+                    logger.warning("Failed extracting CUR ids for %s: %s", cu_id, e)
+                    failed_units += 1
                     cur_ids = []
 
                 # Step 2: fetch each CUR payload via Course API, append to JSONL
-                for cur_id in cur_ids:
+                for cur_id in dict.fromkeys(cur_ids):
+                    if (cu_id, cur_id) in seen_cur_ids:
+                        continue
+
                     try:
                         rec = course_api.fetch_course_unit_realisation(cur_id)
                     except Exception as e:
-                        # 404s happen; keep going
                         logger.warning("Failed fetching CUR %s: %s", cur_id, e)
                         continue
+                    if rec is None:
+                        # 404s happen; keep going
+                        continue
 
                     # Ensure courseUnitId is present in output record
-                    if isinstance(rec, dict) and "courseUnitId" not in rec:
-                        rec["courseUnitId"] = cu_id
-                    append_jsonl(args.out, rec)
+                    written_cu_id = cu_id
+                    if isinstance(rec, dict):
+                        written_cu_id = rec.setdefault("courseUnitId", cu_id)
+                    append_jsonl(out, rec)
+                    seen_cur_ids.add((written_cu_id, cur_id))
                     written_records += 1
 
                 processed_units = i + 1
 
                 # checkpoint
                 if processed_units % args.flush_every == 0:
-                    save_state(args.state, {
+                    # Records must be on disk before the state points past them
+                    out.flush()
+                    append_checkpoint(checkpoints, {
                         "next_index": i + 1,  # next CU to process
                         "last_course_unit_id": cu_id,
                         "processed_units": processed_units,
@@ -119,7 +222,8 @@ def main() -> None:
 
         except KeyboardInterrupt:
             logger.warning("Interrupted. Saving checkpoint...")
-            logger.warning("Interrupted. Saving checkpoint...")
+            out.flush()
+            checkpoints.close()
             i = current_index
             save_state(args.state, {
                 "next_index": i,  # resume from current CU next time
@@ -131,8 +235,6 @@ def main() -> None:
             })
             logger.warning("Checkpoint saved. Exiting cleanly.")
             return
-        finally:
-            course_api.close()
 
     save_state(args.state, {
         "next_index": len(course_unit_ids),
@@ -144,6 +246,8 @@ def main() -> None:
         "done": True,
     })
 
+    if failed_units:
+        logger.warning("%d course units failed CUR id extraction", failed_units)
     print(f"Done. Wrote {written_records} JSONL records to {args.out}")
 
 
@@ -9,7 +9,9 @@ import os
 import logging
 from typing import Any, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
 
+from .client import _SessionRetry
 from .exceptions import SisuHTTPError, SisuTimeoutError, SisuConnectionError
 
 logger = logging.getLogger(__name__)
@@ -19,18 +21,48 @@ class AaltoCourseApiClient:
     BASE_URL = "https://course.api.aalto.fi/api/sisu/v1"
     DEFAULT_TIMEOUT = 15
     ENV_KEY_NAME = "AALTO_COURSE_API_KEY"
+    POOL_MAXSIZE = 32
+    MAX_RETRIES = 3
+    READ_RETRIES = 1
+    RETRY_BACKOFF = 0.5
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
 
-    def __init__(self, base_url: str | None = None, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        session: requests.Session | None = None,
+    ):
         self.base_url = base_url or self.BASE_URL
         self.timeout = timeout
-        self._session: requests.Session | None = None
-
-    @property
-    def session(self) -> requests.Session:
-        if self._session is None:
-            self._session = requests.Session()
-            self._session.headers.update({"User-Agent": "Sisukas-Historical-Fetch/1.0"})
-        return self._session
+        # An injected session is shared with its owner, who also closes it
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": "Sisukas-Historical-Fetch/1.0"})
+            # Blocking pool: fan-out threads queue for a keep-alive connection
+            session.mount("https://", HTTPAdapter(
+                pool_maxsize=self.POOL_MAXSIZE,
+                pool_block=True,
+                max_retries=_SessionRetry(
+                    total=self.MAX_RETRIES,
+                    backoff_factor=self.RETRY_BACKOFF,
+                    status_forcelist=self.RETRY_STATUSES,
+                    # Same policy as SisuClient: one retry for dropped
+                    # connections, none for read timeouts, and no uncapped
+                    # Retry-After sleeps
+                    read=self.READ_RETRIES,
+                    respect_retry_after_header=False,
+                    raise_on_status=False,
+                )))
+        self.session = session
+        # Session.get re-reads proxy/CA env settings per call; the base URL
+        # is fixed, so resolve them once and hand them to Session.send
+        self._send_settings = self.session.merge_environment_settings(
+            self.base_url, {}, None, None, None)
+        # Resolve the key once; a missing key is a configuration error
+        self._api_key = self._get_api_key()
+        self._auth_params = {"USER_KEY": self._api_key}
 
     def _get_api_key(self) -> str:
         key = os.getenv(self.ENV_KEY_NAME)
@@ -44,18 +76,30 @@ class AaltoCourseApiClient:
         self,
         endpoint: str,
         timeout: Optional[int] = None,
-    ) -> Dict[str, Any]:
-        url = f"{self.base_url}{endpoint}"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send a GET request to the Course API and return the JSON response
+
+        Returns:
+            Parsed JSON response, or None if the resource does not exist (404)
+        """
+        url = self.base_url + endpoint
         timeout = timeout or self.timeout
-        params = {"USER_KEY": self._get_api_key()}
 
         try:
             logger.debug("GET %s", url)
-            resp = self.session.get(url, params=params, timeout=timeout)
+            prepared = self.session.prepare_request(
+                requests.Request("GET", url, params=self._auth_params))
+            resp = self.session.send(prepared, timeout=timeout, **self._send_settings)
+            if resp.status_code == 404:
+                # Common for historical ids; not worth an exception per miss
+                logger.debug("Not found: %s", url)
+                return None
             resp.raise_for_status()
             return resp.json()
         except requests.HTTPError as exc:
-            status_code = exc.response.status_code if exc.response else None
+            # Response is falsy for error statuses and may be None entirely
+            status_code = getattr(exc.response, "status_code", None)
             logger.error("HTTP error fetching %s: %s", url, exc)
             raise SisuHTTPError(
                 f"Failed to fetch {endpoint}: {status_code}",
@@ -72,17 +116,22 @@ class AaltoCourseApiClient:
         self,
         realisation_id: str,
         timeout: Optional[int] = None,
-    ) -> Dict[str, Any]:
+    ) -> Optional[Dict[str, Any]]:
         """
         Endpoint:
           GET /courseunitrealisations/{id}?USER_KEY=...
 
         Returns:
-          One historical realisation record.
+          One historical realisation record, or None if it does not exist.
         """
         return self.get_json(f"/courseunitrealisations/{realisation_id}", timeout=timeout)
 
     def close(self) -> None:
-        if self._session is not None:
-            self._session.close()
-            self._session = None
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,127 @@
+"""
+Caching helpers
+
+Small, dependency-free caches used to avoid repeating Sisu API calls
+for data that changes on the scale of semesters (e.g. course units).
+TTLCache lives in memory; SqliteCache persists across runs.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe mapping with a maximum size and a per-entry time-to-live
+
+    Expired entries are dropped lazily on lookup. When the cache is full,
+    the least recently used entry is evicted to make room for a new one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of entries kept in memory
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used if full"""
+        with self._lock:
+            self._data.pop(key, None)
+            while len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SqliteCache:
+    """
+    Persistent JSON cache backed by a single SQLite file
+
+    Safe to share between threads. Entries older than ttl seconds are
+    treated as missing and overwritten on the next store.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: Database file path; parent directories are created
+            ttl: Entry lifetime in seconds
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL + NORMAL avoids an fsync per stored entry
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] + self.ttl <= time.time():
+            return None
+        return json.loads(row[1])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key"""
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, stored_at, value) VALUES (?, ?, ?)",
+                (key, time.time(), payload),
+            )
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -6,8 +6,14 @@ including connection pooling, error handling, and request/response parsing.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Any, Dict, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+from .cache import SqliteCache, TTLCache
 from .exceptions import (
     SisuAPIError, SisuBatchError, SisuHTTPError, SisuTimeoutError, SisuConnectionError, SisuNotFoundError
 )
@@ -16,6 +22,23 @@ from .exceptions import (
 logger = logging.getLogger(__name__)
 
 
+class _SessionRetry(Retry):
+    """Retry policy that re-raises read timeouts on the first attempt
+
+    urllib3 counts dropped or reset connections as read errors too, so
+    ``read=False`` would stop those being retried as well.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        # A read timeout already waited the full timeout; re-raise it as-is
+        # so it still surfaces as a timeout
+        if isinstance(error, ReadTimeoutError):
+            raise error.with_traceback(_stacktrace)
+        return super().increment(
+            method, url, response, error, _pool, _stacktrace)
+
+
 class SisuClient:
     """
     Low-level HTTP client for the Aalto Sisu API
@@ -26,28 +49,71 @@ class SisuClient:
 
     BASE_URL = "https://sisu.aalto.fi/kori/api"
     DEFAULT_TIMEOUT = 10
-
-    def __init__(self, base_url: str | None = None, timeout: int = 10):
+    # Study event ids are ~40 chars, so 50 per request keeps URLs under ~4 KB
+    STUDY_EVENT_BATCH_SIZE = 50
+    STUDY_EVENT_MAX_WORKERS = 8
+    COURSE_UNIT_CACHE_SIZE = 4096
+    COURSE_UNIT_CACHE_TTL = 24 * 60 * 60
+    # Published realisations change during enrolment, so cache them briefly
+    REALISATIONS_CACHE_SIZE = 512
+    REALISATIONS_CACHE_TTL = 30 * 60
+    # Connections per host; also caps in-flight requests, since threads
+    # wait for a free pooled connection instead of opening extra ones
+    POOL_MAXSIZE = 32
+    # Transient failures (rate limiting, gateway errors, refused connections)
+    # are retried with exponential backoff before get_json reports them;
+    # a dropped or reset connection is retried once, a read timeout never
+    MAX_RETRIES = 3
+    READ_RETRIES = 1
+    RETRY_BACKOFF = 0.5
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: int = 10,
+        session: requests.Session | None = None,
+        persistent_cache: SqliteCache | None = None
+    ):
         """
         Initialize the Sisu API client
 
         Args:
             base_url: Override the default API base URL
             timeout: Default timeout for requests in seconds
+            session: Shared requests session; the caller remains
+                responsible for closing it
+            persistent_cache: On-disk cache for unfiltered realisation
+                lists; the caller remains responsible for closing it
         """
         self.base_url = base_url or self.BASE_URL
         self.timeout = timeout
-        self._session: requests.Session | None = None
-
-    @property
-    def session(self) -> requests.Session:
-        """Get or create a requests session for connection pooling"""
-        if self._session is None:
-            self._session = requests.Session()
-            self._session.headers.update({
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
                 'User-Agent': 'SisuAPI-Python-Wrapper/1.0'
             })
-        return self._session
+            session.mount("https://", HTTPAdapter(
+                pool_maxsize=self.POOL_MAXSIZE,
+                pool_block=True,
+                max_retries=_SessionRetry(
+                    total=self.MAX_RETRIES,
+                    backoff_factor=self.RETRY_BACKOFF,
+                    status_forcelist=self.RETRY_STATUSES,
+                    read=self.READ_RETRIES,
+                    # Retry-After is uncapped in urllib3 and would block the
+                    # calling thread; use the bounded backoff instead
+                    respect_retry_after_header=False,
+                    raise_on_status=False,
+                )))
+        # Set eagerly so the request path is a plain attribute lookup
+        self.session = session
+        self._course_unit_cache = TTLCache(
+            self.COURSE_UNIT_CACHE_SIZE, self.COURSE_UNIT_CACHE_TTL)
+        self._realisations_cache = TTLCache(
+            self.REALISATIONS_CACHE_SIZE, self.REALISATIONS_CACHE_TTL)
+        self.persistent_cache = persistent_cache
 
     def get_json(
         self,
@@ -71,7 +137,7 @@ class SisuClient:
             SisuTimeoutError: If the request times out
             SisuConnectionError: If connection fails
         """
-        url = f"{self.base_url}{endpoint}"
+        url = self.base_url + endpoint
         timeout = timeout or self.timeout
 
         try:
@@ -81,7 +147,8 @@ class SisuClient:
             response.raise_for_status()
             return response.json()
         except requests.HTTPError as exc:
-            status_code = exc.response.status_code
+            # response can be None if the connection dropped mid-headers
+            status_code = getattr(exc.response, "status_code", None)
             logger.error("HTTP error fetching %s: %s", url, exc)
             if status_code == 404:
                 raise SisuNotFoundError(
@@ -108,6 +175,10 @@ class SisuClient:
         """
         Fetch detailed metadata for a course unit
 
+        Successful responses are cached in memory for
+        COURSE_UNIT_CACHE_TTL seconds; callers must not mutate the
+        returned dictionary.
+
         Args:
             course_unit_id: The ID of the course unit
             timeout: Request timeout in seconds
@@ -115,9 +186,15 @@ class SisuClient:
         Returns:
             Course unit data dictionary
         """
-        return self.get_json(
+        cached = self._course_unit_cache.get(course_unit_id)
+        if cached is not None:
+            return cached
+
+        data = self.get_json(
             f"/course-units/{course_unit_id}",
             timeout=timeout)
+        self._course_unit_cache.set(course_unit_id, data)
+        return data
 
     def fetch_course_realisations(
         self,
@@ -133,6 +210,10 @@ class SisuClient:
         through the broader /course-unit-realisations endpoint, which
         returns an unfiltered list spanning many years.
 
+        Successful responses are cached in memory for
+        REALISATIONS_CACHE_TTL seconds; callers must not mutate the
+        returned list.
+
         Args:
             assessment_item_id: The assessment item ID
             timeout: Request timeout in seconds
@@ -140,11 +221,20 @@ class SisuClient:
         Returns:
             List of course realisation dictionaries
         """
-        return self.get_json(
+        # Decoded whole rather than streamed: the list is cached and
+        # scanned for different offerings, and the published endpoint
+        # returns only a handful of realisations per item
+        cached = self._realisations_cache.get(assessment_item_id)
+        if cached is not None:
+            return cached
+
+        data = self.get_json(
             "/course-unit-realisations/published",
             params={"assessmentItemId": assessment_item_id},
             timeout=timeout
         )
+        self._realisations_cache.set(assessment_item_id, data)
+        return data
     
     def fetch_course_unit_realisations_all(
         self,
@@ -155,6 +245,9 @@ class SisuClient:
         Retrieve course unit realisations for an assessment item WITHOUT the
         "published/upcoming-only" filtering.
 
+        Historical lists rarely change, so they are read from and stored in
+        the persistent cache when one is configured.
+
         Args:
             assessment_item_id: The assessment item ID
             timeout: Request timeout in seconds
@@ -162,11 +255,20 @@ class SisuClient:
         Returns:
             List of course unit realisation dictionaries.
         """
-        return self.get_json(
+        cache_key = f"course-unit-realisations:{assessment_item_id}"
+        if self.persistent_cache is not None:
+            cached = self.persistent_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        realisations = self.get_json(
             "/course-unit-realisations",
             params={"assessmentItemId": assessment_item_id},
             timeout=timeout
         )
+        if self.persistent_cache is not None:
+            self.persistent_cache.set(cache_key, realisations)
+        return realisations
 
     def fetch_study_events(
         self,
@@ -180,6 +282,10 @@ class SisuClient:
         cancellation status. Location/venue data is not included in the
         API response.
 
+        Long id lists are split into batches of STUDY_EVENT_BATCH_SIZE to
+        stay within URL length limits; the batches are fetched concurrently
+        and concatenated in their original order.
+
         Args:
             study_event_ids: List of study event IDs
             timeout: Request timeout in seconds
@@ -188,6 +294,27 @@ class SisuClient:
             List of study event data
 
         """
+        size = self.STUDY_EVENT_BATCH_SIZE
+        batches = [
+            study_event_ids[i:i + size]
+            for i in range(0, len(study_event_ids), size)
+        ]
+
+        if len(batches) <= 1:
+            return self._fetch_study_events_batch(study_event_ids, timeout)
+
+        workers = min(self.STUDY_EVENT_MAX_WORKERS, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(chain.from_iterable(executor.map(
+                lambda batch: self._fetch_study_events_batch(batch, timeout),
+                batches)))
+
+    def _fetch_study_events_batch(
+        self,
+        study_event_ids: List[str],
+        timeout: Optional[int] = None
+    ) -> List[Any]:
+        """Fetch a single batch of study events in one request"""
         return self.get_json(
             "/study-events",
             params={"id": ",".join(study_event_ids)},
@@ -294,11 +421,16 @@ class SisuClient:
             timeout=timeout,
         )
 
+    def clear_cache(self) -> None:
+        """Drop in-memory cached responses (the persistent cache is kept)"""
+        self._course_unit_cache.clear()
+        self._realisations_cache.clear()
+
     def close(self) -> None:
-        """Close the requests session if it exists"""
-        if self._session is not None:
-            self._session.close()
-            self._session = None
+        """Close pooled connections and release cached responses"""
+        self.clear_cache()
+        if self._owns_session:
+            self.session.close()
 
     def __enter__(self):
         """Context manager entry"""
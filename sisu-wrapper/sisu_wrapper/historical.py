@@ -1,18 +1,31 @@
 import json
 import logging
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, List, Set
+from itertools import islice
+from queue import SimpleQueue
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
 
 from .client import SisuClient
 from .aalto_api_client import AaltoCourseApiClient
 from .historical_parsing import (
     parse_course_unit_assessment_index,
-    parse_course_unit_realisation_summary,
+    parse_start_date_and_id,
 )
 
 logger = logging.getLogger(__name__)
 
+# Concurrent realisation lookups per course unit when no executor is given
+ASSESSMENT_ITEM_MAX_WORKERS = 8
+# Course API records kept after their last waiting unit completes, so a
+# realisation cross-listed under a later unit is usually not refetched
+RECENT_RECORDS_SIZE = 4096
+
 
 @dataclass(frozen=True)
 class DateRange:
@@ -22,30 +35,110 @@ class DateRange:
     def contains(self, d: date) -> bool:
         return self.start <= d <= self.end
 
-def read_course_unit_ids_from_courses_json(path: str) -> List[str]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
 
-    if not isinstance(data, list):
-        raise ValueError("courses.json must be a list")
 
-    seen: Set[str] = set()
-    out: List[str] = []
+def _refill(f: TextIO, buf: str, pos: int, chunk_size: int) -> Tuple[str, int, bool]:
+    # Read at least as much as is buffered so oversized elements stay linear
+    chunk = f.read(max(chunk_size, len(buf) - pos))
+    return buf[pos:] + chunk, 0, not chunk
 
-    for entry in data:
-        if not isinstance(entry, dict):
+def _iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time
+
+    Only the read buffer and the current element are held in memory, so
+    large files can be scanned without building the whole document.
+    Elements are decoded with the stdlib C scanner.
+
+    Raises:
+        ValueError: If the document is not a JSON array or is malformed
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    state = "start"  # start -> first -> (value -> sep)* -> "]"
+
+    while True:
+        pos = _JSON_WHITESPACE.match(buf, pos).end()
+        if pos == len(buf) and not eof:
+            buf, pos, eof = _refill(f, buf, pos, chunk_size)
             continue
-        cu = entry.get("courseUnitId")
-        if isinstance(cu, str) and cu not in seen:
-            seen.add(cu)
-            out.append(cu)
+        ch = buf[pos:pos + 1]
+
+        if state == "start":
+            if ch != "[":
+                raise ValueError(f"{getattr(f, 'name', 'JSON input')} must be a list")
+            pos += 1
+            state = "first"
+        elif ch == "]" and state in ("first", "sep"):
+            return
+        elif state == "sep":
+            if ch != ",":
+                raise ValueError(f"Malformed JSON array at offset {pos}")
+            pos += 1
+            state = "value"
+        else:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = len(buf)
+            if not eof:
+                # A cut number still decodes ("1.5" cut to "1" or "1."), so
+                # only trust the element once its delimiter is buffered
+                nxt = _JSON_WHITESPACE.match(buf, end).end()
+                if nxt == len(buf) or buf[nxt] not in ",]":
+                    buf, pos, eof = _refill(f, buf, pos, chunk_size)
+                    continue
+            yield item
+            pos = end
+            state = "sep"
+
+def _entry_assessment_item_ids(entry: Dict[str, Any]) -> Optional[List[str]]:
+    ids = entry.get("assessmentItemIds")
+    if not isinstance(ids, list):
+        return None
+    return [item_id for item_id in ids if isinstance(item_id, str)] or None
+
+def iter_course_units_from_courses_json(
+    path: str,
+) -> Iterator[Tuple[str, Optional[List[str]]]]:
+    """
+    Yield unique (courseUnitId, assessmentItemIds) pairs from courses.json
 
-    return out
+    Pairs come in first-seen order. assessmentItemIds is None when the
+    entry does not carry them (older exports), in which case they have
+    to be read from the course unit itself.
+
+    The file is streamed element by element, so ids are available before
+    the whole file is read and memory use is bounded by the number of
+    ids rather than the size of the file.
+    """
+    seen: Set[str] = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for entry in _iter_json_array(f):
+            if not isinstance(entry, dict):
+                continue
+            cu = entry.get("courseUnitId")
+            if isinstance(cu, str) and cu not in seen:
+                seen.add(cu)
+                yield cu, _entry_assessment_item_ids(entry)
+
+def read_course_units_from_courses_json(
+    path: str,
+) -> List[Tuple[str, Optional[List[str]]]]:
+    """List the pairs from iter_course_units_from_courses_json"""
+    return list(iter_course_units_from_courses_json(path))
+
+def read_course_unit_ids_from_courses_json(path: str) -> List[str]:
+    return [cu for cu, _ in iter_course_units_from_courses_json(path)]
 
 def extract_historical_realisation_ids_for_assessment_items(
     sisu: SisuClient,
     assessment_item_ids: List[str],
     date_range: DateRange,
+    executor: Executor | None = None,
 ) -> List[str]:
     """
     Extract historical course unit realisation IDs for known assessment items
@@ -54,42 +147,60 @@ def extract_historical_realisation_ids_for_assessment_items(
     When assessmentItemIds are already available (e.g. from course-unit-search),
     we can skip fetching the course unit payload entirely.
 
+    Realisation lists are fetched concurrently; parsing and deduplication
+    then run in assessment item order, so the result is deterministic.
+
     Args:
         sisu: Sisu client
         assessment_item_ids: Assessment item IDs for the course unit
         date_range: Date range filter for realisation activity start dates
+        executor: Pool for the realisation requests. Must not be the pool
+            this call itself runs on, as waiting on it could deadlock.
 
     Returns:
         List of course unit realisation IDs (CUR ids)
     """
-    seen: Set[str] = set()
-    out: List[str] = []
-
-    for assessment_id in assessment_item_ids:
-        raw_realisations = sisu.fetch_course_unit_realisations_all(assessment_id)
-
+    fetch = sisu.fetch_course_unit_realisations_all
+    if executor is not None:
+        raw_lists = list(executor.map(fetch, assessment_item_ids))
+    elif len(assessment_item_ids) > 1:
+        workers = min(ASSESSMENT_ITEM_MAX_WORKERS, len(assessment_item_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            raw_lists = list(pool.map(fetch, assessment_item_ids))
+    else:
+        raw_lists = [fetch(assessment_id) for assessment_id in assessment_item_ids]
+
+    # Insertion-ordered dedup of accepted CUR ids
+    out: Dict[str, None] = {}
+    # The same realisation is often listed under several assessment items
+    parsed_cache: Dict[str, Optional[Tuple[str, date]]] = {}
+
+    for raw_realisations in raw_lists:
         for raw in raw_realisations:
             if not isinstance(raw, dict):
                 continue
 
-            summary = parse_course_unit_realisation_summary(raw)
-            if summary is None:
+            rid = raw.get("id")
+            if isinstance(rid, str) and rid in parsed_cache:
+                parsed = parsed_cache[rid]
+            else:
+                parsed = parse_start_date_and_id(raw)
+                if isinstance(rid, str):
+                    parsed_cache[rid] = parsed
+            if parsed is None:
                 continue
 
-            start = summary.activity_period.start_date
-            if start is None:
-                continue
-
-            if date_range.contains(start) and summary.id not in seen:
-                seen.add(summary.id)
-                out.append(summary.id)
+            rid, start = parsed
+            if date_range.contains(start):
+                out.setdefault(rid, None)
 
-    return out
+    return list(out)
 
 def extract_historical_realisation_ids_for_course_unit(
     sisu: SisuClient,
     course_unit_id: str,
     date_range: DateRange,
+    executor: Executor | None = None,
 ) -> List[str]:
     """
     Extract historical course unit realisation IDs for a course unit
@@ -101,6 +212,7 @@ def extract_historical_realisation_ids_for_course_unit(
         sisu: Sisu client
         course_unit_id: Course unit ID
         date_range: Date range filter for realisation activity start dates
+        executor: Pool for the per-assessment-item realisation requests
 
     Returns:
         List of course unit realisation IDs (CUR ids)
@@ -116,8 +228,41 @@ def extract_historical_realisation_ids_for_course_unit(
         sisu=sisu,
         assessment_item_ids=index.assessment_item_ids,
         date_range=date_range,
+        executor=executor,
     )
 
+def _extract_realisation_ids_for_course_unit(
+    sisu: SisuClient,
+    course_unit_id: str,
+    assessment_item_ids: List[str] | None,
+    date_range: DateRange,
+    item_executor: Executor,
+) -> List[str]:
+    # Errors propagate: a unit that failed must not look like an empty one
+    if assessment_item_ids:
+        # Known from courses.json; no need to fetch the course unit
+        return extract_historical_realisation_ids_for_assessment_items(
+            sisu, assessment_item_ids, date_range, executor=item_executor
+        )
+    return extract_historical_realisation_ids_for_course_unit(
+        sisu, course_unit_id, date_range, executor=item_executor
+    )
+
+def _read_written_course_unit_ids(output_path: str) -> Set[str]:
+    # Complete lines only; a torn last line means the unit is redone
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and isinstance(entry.get("course_unit_id"), str):
+                done.add(entry["course_unit_id"])
+    return done
+
 def fetch_historical_realisations_for_courses_json(
     courses_json_path: str,
     sisu: SisuClient,
@@ -125,36 +270,224 @@ def fetch_historical_realisations_for_courses_json(
     date_range: DateRange,
     limit_course_units: int | None = None,
     limit_realisations_per_unit: int | None = None,
-) -> Dict[str, List[dict]]:
-    course_unit_ids = read_course_unit_ids_from_courses_json(courses_json_path)
-
-    if limit_course_units is not None:
-        course_unit_ids = course_unit_ids[:limit_course_units]
+    max_workers: int = 16,
+    output_path: str | None = None,
+) -> Dict[str, List[dict]] | Dict[str, int]:
+    """
+    Fetch historical realisation records for every course unit in courses.json
+
+    Course units are processed on a thread pool; both clients share their
+    pooled sessions across the workers. Each unit first has its
+    realisation ids extracted, with a second, shared pool serving the
+    per-assessment-item lookups so units never block on their own pool.
+    Entries that already list their assessmentItemIds skip the course
+    unit request. As soon as a unit's ids are known, its realisations are
+    fetched from the Course API; a realisation cross-listed under several
+    units is fetched once while any of them is waiting for it, and
+    recently fetched records are reused for later units. courses.json is
+    streamed, so the first units start before the whole file is read.
+
+    With output_path, each unit is appended to a JSONL file as
+    {"course_unit_id": ..., "records": [...]} as soon as it completes and
+    is not kept in memory. Units already in the file are skipped, so an
+    interrupted run can be repeated to resume it.
+
+    A unit whose id extraction or any record fetch fails is logged and
+    left out of the result (and the file), so a rerun retries it. A
+    realisation that no longer exists (404) is not a failure.
 
-    out: Dict[str, List[dict]] = {}
+    Args:
+        courses_json_path: Path to courses.json
+        sisu: Sisu client
+        course_api: Aalto Course API client
+        date_range: Date range filter for realisation activity start dates
+        limit_course_units: Only process the first N course units
+        limit_realisations_per_unit: Fetch at most N realisations per unit
+        max_workers: Number of concurrent workers per pool
+        output_path: JSONL file to stream per-unit results to
 
-    for idx, course_unit_id in enumerate(course_unit_ids, start=1):
-        logger.info("[%d/%d] %s", idx, len(course_unit_ids), course_unit_id)
+    Returns:
+        Mapping of course_unit_id -> realisation records, in courses.json
+        order; with output_path, course_unit_id -> number of records
+        written in this run instead. Failed units are omitted.
+    """
+    course_units: Iterator[Tuple[str, Optional[List[str]]]] = (
+        iter_course_units_from_courses_json(courses_json_path))
 
-        try:
-            realisation_ids = extract_historical_realisation_ids_for_course_unit(
-                sisu, course_unit_id, date_range
+    if limit_course_units is not None:
+        course_units = islice(course_units, limit_course_units)
+
+    if output_path is not None:
+        done = _read_written_course_unit_ids(output_path)
+        if done:
+            logger.info("Skipping %d course units already in %s", len(done), output_path)
+            course_units = (cu for cu in course_units if cu[0] not in done)
+
+    # Filled as the pipeline pulls units, so results keep courses.json order
+    course_unit_ids: List[str] = []
+
+    results: Dict[str, List[dict]] = {}
+    written: Dict[str, int] = {}
+    failed: Set[str] = set()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    item_executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        with (open(output_path, "a", encoding="utf-8") if output_path is not None
+              else nullcontext()) as out:
+            _run_course_unit_pipeline(
+                course_units, sisu, course_api, date_range,
+                limit_realisations_per_unit, max_workers,
+                executor, item_executor, out, course_unit_ids,
+                results, written, failed,
             )
+    except BaseException:
+        # Don't sit through every queued request on Ctrl+C or an error
+        item_executor.shutdown(wait=False, cancel_futures=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    item_executor.shutdown()
+
+    if failed:
+        logger.warning("%d course units failed and will be retried on the next run", len(failed))
+    if output_path is not None:
+        return {cuid: written[cuid] for cuid in course_unit_ids if cuid in written}
+    return {cuid: results[cuid] for cuid in course_unit_ids if cuid in results}
+
+def _run_course_unit_pipeline(
+    course_units: Iterator[Tuple[str, Optional[List[str]]]],
+    sisu: SisuClient,
+    course_api: AaltoCourseApiClient,
+    date_range: DateRange,
+    limit_realisations: int | None,
+    max_workers: int,
+    executor: Executor,
+    item_executor: Executor,
+    out: TextIO | None,
+    started: List[str],
+    results: Dict[str, List[dict]],
+    written: Dict[str, int],
+    failed: Set[str],
+) -> None:
+    # Finished futures are handed back to this thread through one queue,
+    # so extractions and record fetches are handled as they complete
+    finished: "SimpleQueue[Tuple[bool, str, Future]]" = SimpleQueue()
+    outstanding = 0
+
+    def submit(is_unit: bool, key: str, fn, *args) -> None:
+        nonlocal outstanding
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda f: finished.put((is_unit, key, f)))
+        outstanding += 1
+
+    # Only a few units are extracted ahead, so record fetches never queue
+    # behind the whole catalogue
+    def submit_next_unit() -> None:
+        for course_unit_id, assessment_item_ids in course_units:
+            started.append(course_unit_id)
+            submit(True, course_unit_id, _extract_realisation_ids_for_course_unit,
+                   sisu, course_unit_id, assessment_item_ids, date_range,
+                   item_executor)
+            return
+
+    unit_rids: Dict[str, List[str]] = {}
+    pending: Dict[str, int] = {}
+    # Units waiting on each in-flight realisation
+    waiting: Dict[str, List[str]] = {}
+    # Records (None for a 404) held for units still in progress
+    records: Dict[str, Optional[dict]] = {}
+    refs: Dict[str, int] = {}
+    recent: "OrderedDict[str, Optional[dict]]" = OrderedDict()
+    failed_rids: Set[str] = set()
+    completed = 0
+
+    def complete(course_unit_id: str) -> None:
+        nonlocal completed
+        rids = unit_rids.pop(course_unit_id)
+        del pending[course_unit_id]
+        unit_records = [records[rid] for rid in rids if records.get(rid) is not None]
+        for rid in rids:
+            refs[rid] -= 1
+            if refs[rid]:
+                continue
+            del refs[rid]
+            if rid in records:
+                recent[rid] = records.pop(rid)
+                if len(recent) > RECENT_RECORDS_SIZE:
+                    recent.popitem(last=False)
+
+        completed += 1
+        logger.info("[%d] %s", completed, course_unit_id)
+
+        if course_unit_id in failed:
+            # Not recorded anywhere, so the next run picks it up again
+            return
+        if out is None:
+            results[course_unit_id] = unit_records
+            return
+
+        # Written from this thread only, so lines never interleave
+        out.write(json.dumps(
+            {"course_unit_id": course_unit_id, "records": unit_records},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ))
+        out.write("\n")
+        written[course_unit_id] = len(unit_records)
+
+    def unit_extracted(course_unit_id: str, future: Future) -> None:
+        try:
+            rids = future.result()
         except Exception as e:
-            logger.exception("Failed processing %s: %s", course_unit_id, e)
-            out[course_unit_id] = []
-            continue
-
-        if limit_realisations_per_unit is not None:
-            realisation_ids = realisation_ids[:limit_realisations_per_unit]
-
-        records: List[dict] = []
-        for rid in realisation_ids:
-            try:
-                records.append(course_api.fetch_course_unit_realisation(rid))
-            except Exception as e:
-                logger.warning("Failed fetching realisation %s: %s", rid, e)
-
-        out[course_unit_id] = records
-
-    return out
+            logger.warning("Failed processing %s: %s", course_unit_id, e)
+            failed.add(course_unit_id)
+            rids = []
+        if limit_realisations is not None:
+            rids = rids[:limit_realisations]
+
+        unit_rids[course_unit_id] = rids
+        pending[course_unit_id] = 0
+        for rid in rids:
+            refs[rid] = refs.get(rid, 0) + 1
+            if rid in records:
+                continue
+            if rid in recent:
+                records[rid] = recent.pop(rid)
+            elif rid in failed_rids:
+                failed.add(course_unit_id)
+            elif rid in waiting:
+                waiting[rid].append(course_unit_id)
+                pending[course_unit_id] += 1
+            else:
+                waiting[rid] = [course_unit_id]
+                pending[course_unit_id] += 1
+                submit(False, rid, course_api.fetch_course_unit_realisation, rid)
+
+        if not pending[course_unit_id]:
+            complete(course_unit_id)
+
+    def record_fetched(rid: str, future: Future) -> None:
+        course_unit_ids = waiting.pop(rid)
+        try:
+            records[rid] = future.result()
+        except Exception as e:
+            logger.warning("Failed fetching realisation %s: %s", rid, e)
+            failed_rids.add(rid)
+            failed.update(course_unit_ids)
+        for course_unit_id in course_unit_ids:
+            pending[course_unit_id] -= 1
+            if not pending[course_unit_id]:
+                complete(course_unit_id)
+
+    for _ in range(2 * max_workers):
+        submit_next_unit()
+
+    while outstanding:
+        is_unit, key, future = finished.get()
+        outstanding -= 1
+        if is_unit:
+            submit_next_unit()
+            unit_extracted(key, future)
+        else:
+            record_fetched(key, future)
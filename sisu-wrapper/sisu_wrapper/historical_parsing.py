@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .models_historical import (
     ActivityPeriod,
@@ -20,15 +20,14 @@ def parse_course_unit_assessment_index(
     course_unit_id: str,
     course_unit_data: Dict[str, object],
 ) -> CourseUnitAssessmentIndex:
-    completion_methods = course_unit_data.get("completionMethods", []) or []
+    completion_methods = course_unit_data.get("completionMethods") or ()
 
-    assessment_item_ids: List[str] = []
-    for method in completion_methods:
-        if not isinstance(method, dict):
-            continue
-        for item_id in method.get("assessmentItemIds", []) or []:
-            if isinstance(item_id, str):
-                assessment_item_ids.append(item_id)
+    assessment_item_ids: List[str] = [
+        item_id
+        for method in completion_methods if isinstance(method, dict)
+        for item_id in method.get("assessmentItemIds") or ()
+        if isinstance(item_id, str)
+    ]
 
     return CourseUnitAssessmentIndex(
         course_unit_id=course_unit_id,
@@ -53,3 +52,26 @@ def parse_course_unit_realisation_summary(
         id=rid,
         activity_period=ActivityPeriod(start, end),
     )
+
+def parse_start_date_and_id(
+    data: Dict[str, object],
+) -> Optional[Tuple[str, date]]:
+    """
+    Read only the id and activity start date of a realisation entry
+
+    Lighter than parse_course_unit_realisation_summary for callers that
+    just filter by start date; returns None if either is missing/invalid.
+    """
+    rid = data.get("id")
+    if not isinstance(rid, str):
+        return None
+
+    ap = data.get("activityPeriod")
+    if not isinstance(ap, dict):
+        return None
+
+    start = _parse_date(ap.get("startDate"))
+    if start is None:
+        return None
+
+    return rid, start
@@ -11,12 +11,28 @@ Limitations:
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 from typing import List
 
 HELSINKI = ZoneInfo("Europe/Helsinki")
 
-@dataclass
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(s: str) -> datetime:
+    # Events of the same group share timestamps, and sorting or rendering
+    # re-reads them; datetimes are immutable, so sharing is safe
+    if s.endswith("Z"):
+        # fromisoformat only accepts the "Z" suffix from Python 3.11 on
+        s = s[:-1] + "+00:00"
+    dt = datetime.fromisoformat(s)
+    # If tz missing, assume Helsinki local time; combine() attaches it
+    # several times faster than replace(tzinfo=...)
+    if dt.tzinfo is None:
+        return datetime.combine(dt, dt.time(), HELSINKI)
+    return dt
+
+@dataclass(slots=True)
 class StudyEvent:
     """
     Represents a single study event with start and end times
@@ -31,11 +47,7 @@ class StudyEvent:
     end_iso: str | None = None
 
     def _parse(self, s: str) -> datetime:
-        dt = datetime.fromisoformat(s)
-        # If tz missing, assume Helsinki local time
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=HELSINKI)
-        return dt
+        return _parse_datetime(s)
 
     @property
     def start_datetime(self) -> datetime:
@@ -55,7 +67,7 @@ class StudyEvent:
             self.end_iso = self.end_datetime.isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class StudyGroup:
     """
     Represents a flattened study group, such as a lecture or exercise
@@ -80,7 +92,7 @@ class StudyGroup:
         return f"{self.type}: {self.name} ({len(self.study_events)} events)"
 
 
-@dataclass
+@dataclass(slots=True)
 class CourseOffering:
     """
     Represents a single course offering,
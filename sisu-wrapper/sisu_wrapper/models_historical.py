@@ -3,13 +3,13 @@ from datetime import date
 from typing import List, Dict, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ActivityPeriod:
     start_date: Optional[date]
     end_date: Optional[date]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CourseUnitRealisationSummary:
     """
     Minimal representation of a course-unit-realisations entry
@@ -19,7 +19,7 @@ class CourseUnitRealisationSummary:
     activity_period: ActivityPeriod
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CourseUnitAssessmentIndex:
     """
     Extracted assessment-item index from a course unit.
@@ -6,18 +6,30 @@ course data into domain objects.
 """
 
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import date
+from operator import itemgetter
 from typing import List, Dict, Any, Tuple, Optional
-from functools import lru_cache
 
+from .cache import TTLCache
 from .models import CourseOffering, StudyGroup, StudyEvent
 from .client import SisuClient
+from .exceptions import SisuAPIError
 from .aalto_api_client import AaltoCourseApiClient
 from .historical import DateRange, extract_historical_realisation_ids_for_assessment_items
 from .historical_parsing import parse_course_unit_assessment_index
 
 logger = logging.getLogger(__name__)
 
+# (start, end) of a raw study event, looked up in C
+_event_bounds = itemgetter("start", "end")
+
+
+def _en_name(data: Dict[str, Any], default: str = "") -> str:
+    """Return the English name of a Sisu object, or default"""
+    name = data.get("name")
+    return name.get("en", default) if isinstance(name, dict) else default
+
 
 class SisuService:
     """
@@ -27,11 +39,30 @@ class SisuService:
     raw API responses into domain objects.
     """
 
-    def __init__(self, client: SisuClient):
-        """Initialize the service with a Sisu client"""
+    # Upper bound on concurrent Sisu requests issued for one offering
+    MAX_WORKERS = 8
+    # Offerings fetched concurrently by the batch methods
+    BATCH_MAX_WORKERS = 16
+    # Assembled offerings are reused for an hour; groups rarely change
+    OFFERING_CACHE_SIZE = 128
+    OFFERING_CACHE_TTL = 60 * 60
+    # Concurrent Course API requests when resolving snapshots
+    SNAPSHOT_MAX_WORKERS = 16
+
+    def __init__(self, client: SisuClient, max_workers: Optional[int] = None):
+        """
+        Initialize the service with a Sisu client
+
+        Args:
+            client: Sisu client used for all requests
+            max_workers: Concurrent requests per offering
+                (defaults to MAX_WORKERS)
+        """
         self.client = client
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self._offering_cache = TTLCache(
+            self.OFFERING_CACHE_SIZE, self.OFFERING_CACHE_TTL)
 
-    @lru_cache(maxsize=128)
     def fetch_course_offering(
         self,
         course_unit_id: str,
@@ -40,6 +71,8 @@ class SisuService:
         """
         Fetch complete course offering data including all study groups
 
+        Results are cached per service for OFFERING_CACHE_TTL seconds.
+
         Args:
             course_unit_id: The ID of the course unit in Sisu
             offering_id: The ID of the specific course realisation
@@ -47,6 +80,11 @@ class SisuService:
         Returns:
             CourseOffering object with all associated data
         """
+        key = (course_unit_id, offering_id)
+        cached = self._offering_cache.get(key)
+        if cached is not None:
+            return cached
+
         course_unit_data = self.client.fetch_course_unit(course_unit_id)
 
         assessment_item_ids = [
@@ -55,38 +93,55 @@ class SisuService:
             for item_id in method.get("assessmentItemIds", [])
         ]
 
-        course_name = course_unit_data.get(
-            "name", {}).get("en", "Unnamed Course")
-
-        # Collect all matching realisations
-        matching_realisations = []
-        for assessment_id in assessment_item_ids:
-            for real_data in self.client.fetch_course_realisations(
-                    assessment_id):
-                if real_data.get("id") == offering_id:
-                    matching_realisations.append(real_data)
-
-        # Collect all study groups from those realisations
-        all_groups = []
-        for real_data in matching_realisations:
-            for group_set in real_data.get("studyGroupSets", []):
-                all_groups.extend(self._parse_study_groups(group_set))
-
-        # Deduplicate by group_id
-        flattened_groups = []
-        seen_ids = set()
-        for group in all_groups:
-            if group.group_id not in seen_ids:
-                flattened_groups.append(group)
-                seen_ids.add(group.group_id)
-
-        return CourseOffering(
+        course_name = _en_name(course_unit_data, "Unnamed Course")
+
+        # The offering is listed in full under each of its assessment
+        # items, so the first list that contains it is enough
+        realisation = None
+        if len(assessment_item_ids) == 1:
+            # No point spinning up a pool for a single request
+            realisation = self._find_realisation(
+                self.client.fetch_course_realisations(assessment_item_ids[0]),
+                offering_id)
+        elif assessment_item_ids:
+            workers = min(self.max_workers, len(assessment_item_ids))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self.client.fetch_course_realisations, aid)
+                    for aid in assessment_item_ids
+                ]
+                for future in as_completed(futures):
+                    realisation = self._find_realisation(
+                        future.result(), offering_id)
+                    if realisation is not None:
+                        # Drop lookups that have not started yet
+                        for pending in futures:
+                            pending.cancel()
+                        break
+
+        # Collect study groups from the realisation, deduplicated by
+        # group_id; the first occurrence wins
+        group_sets = (
+            realisation.get("studyGroupSets", []) if realisation is not None
+            else []
+        )
+        # One study event request for the whole offering
+        records_by_id = self._fetch_event_records(group_sets)
+        groups_by_id: Dict[str, StudyGroup] = {}
+        for group_set in group_sets:
+            for group in self._parse_study_groups(group_set, records_by_id):
+                groups_by_id.setdefault(group.group_id, group)
+        flattened_groups = list(groups_by_id.values())
+
+        offering = CourseOffering(
             course_unit_id=course_unit_id,
             offering_id=offering_id,
             name=course_name,
             assessment_items=assessment_item_ids,
             study_groups=flattened_groups
         )
+        self._offering_cache.set(key, offering)
+        return offering
 
     def fetch_study_groups(
         self,
@@ -127,7 +182,7 @@ class SisuService:
 
         Returns:
             Dictionary mapping (course_unit_id, offering_id) -> CourseOffering
-            Failed requests map to None
+            Requests failing with a SisuAPIError map to None
 
         Example:
             offerings = service.fetch_course_offerings_batch([
@@ -135,15 +190,26 @@ class SisuService:
                 ("unit-2", "offering-2"),
             ])
         """
-        results = {}
+        # One slot per distinct request, in request order; duplicates
+        # are fetched once
+        results: Dict[Tuple[str, str], CourseOffering | None] = dict.fromkeys(
+            map(tuple, requests))
+        if not results:
+            return results
+
+        workers = min(self.BATCH_MAX_WORKERS, len(results))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(self.fetch_course_offering, *key)
+                for key in results
+            }
 
-        for course_unit_id, offering_id in requests:
-            key = (course_unit_id, offering_id)
+        # Collected in request order so the result is deterministic
+        for key, future in futures.items():
+            course_unit_id, offering_id = key
             try:
-                results[key] = self.fetch_course_offering(
-                    course_unit_id, offering_id
-                )
-            except Exception as e:
+                results[key] = future.result()
+            except SisuAPIError as e:
                 logger.error(
                     "Failed to fetch offering %s/%s: %s",
                     course_unit_id, offering_id, e
@@ -164,7 +230,7 @@ class SisuService:
 
         Returns:
             Dictionary mapping tuple -> list of StudyGroup objects
-            Failed requests map to empty list
+            Requests failing with a SisuAPIError map to empty list
 
         Example:
             groups = service.fetch_study_groups_batch([
@@ -172,15 +238,26 @@ class SisuService:
                 ("unit-2", "offering-2"),
             ])
         """
-        results = {}
+        # One slot per distinct request, in request order; duplicates
+        # are fetched once
+        results: Dict[Tuple[str, str], List[StudyGroup]] = dict.fromkeys(
+            map(tuple, requests))
+        if not results:
+            return results
+
+        workers = min(self.BATCH_MAX_WORKERS, len(results))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(self.fetch_study_groups, *key)
+                for key in results
+            }
 
-        for course_unit_id, course_offering_id in requests:
-            key = (course_unit_id, course_offering_id)
+        # Collected in request order so the result is deterministic
+        for key, future in futures.items():
+            course_unit_id, course_offering_id = key
             try:
-                results[key] = self.fetch_study_groups(
-                    course_unit_id, course_offering_id
-                )
-            except Exception as e:
+                results[key] = future.result()
+            except SisuAPIError as e:
                 logger.error(
                     "Failed to fetch study groups %s/%s: %s",
                     course_unit_id, course_offering_id, e
@@ -189,37 +266,80 @@ class SisuService:
 
         return results
 
-    def _parse_study_groups(self, group_set_data: Dict[str, Any]
-                            ) -> List[StudyGroup]:
+    def _fetch_event_records(
+        self,
+        group_sets: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the study events of every subgroup in one client call
+
+        Args:
+            group_sets: Raw API data for study group sets
+
+        Returns:
+            Dictionary mapping study event id -> raw study event record
+        """
+        all_event_ids = list(dict.fromkeys(
+            event_id
+            for group_set in group_sets
+            for sub_group_data in group_set.get("studySubGroups", [])
+            for event_id in sub_group_data.get("studyEventIds") or ()
+        ))
+        if not all_event_ids:
+            return {}
+
+        return {
+            record.get("id"): record
+            for record in self.client.fetch_study_events(all_event_ids)
+        }
+
+    def _parse_study_groups(
+        self,
+        group_set_data: Dict[str, Any],
+        records_by_id: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[StudyGroup]:
         """
         Convert a group set with subgroups into a list of StudyGroup instances
 
         Args:
             group_set_data: Raw API data for a study group set
+            records_by_id: Pre-fetched study events by id; fetched for
+                this group set alone if omitted
 
         Returns:
             List of parsed StudyGroup objects
         """
         flattened_groups: List[StudyGroup] = []
-        group_type = group_set_data.get("name", {}).get("en", "Unknown")
-
-        for sub_group_data in group_set_data.get("studySubGroups", []):
-            study_event_ids = sub_group_data.get("studyEventIds", [])
+        group_type = _en_name(group_set_data, "Unknown")
 
-            if not study_event_ids:
-                continue
-
-            event_records = self.client.fetch_study_events(study_event_ids)
+        sub_groups = [
+            sub_group_data
+            for sub_group_data in group_set_data.get("studySubGroups", [])
+            if sub_group_data.get("studyEventIds")
+        ]
+        if not sub_groups:
+            return flattened_groups
+
+        # One request for the whole group set, then split per subgroup
+        if records_by_id is None:
+            records_by_id = self._fetch_event_records([group_set_data])
+
+        for sub_group_data in sub_groups:
+            event_records = [
+                records_by_id[event_id]
+                for event_id in sub_group_data["studyEventIds"]
+                if event_id in records_by_id
+            ]
             study_events = [
-                StudyEvent(start=event["start"], end=event["end"])
+                StudyEvent(*_event_bounds(event))
                 for record in event_records
-                for event in record.get("events", [])
+                for event in record.get("events") or ()
             ]
 
             flattened_groups.append(
                 StudyGroup(
                     group_id=sub_group_data.get("id", ""),
-                    name=sub_group_data.get("name", {}).get("en", ""),
+                    name=_en_name(sub_group_data),
                     type=group_type,
                     study_events=study_events
                 )
@@ -266,9 +386,10 @@ class SisuService:
         results = [r for r in results if isinstance(r, dict)]
 
         # Prefer exact code matches since fullTextQuery is fuzzy.
+        q_upper = q.upper()
         exact = [
             r for r in results
-            if str(r.get("code", "")).strip().upper() == q.upper()
+            if str(r.get("code") or "").strip().upper() == q_upper
         ]
 
         selected = exact if exact else results
@@ -285,86 +406,125 @@ class SisuService:
         if date_range is None:
             date_range = DateRange(start=date(2022, 9, 1), end=date(2100, 1, 1))
 
-        course_unit_ids: List[str] = []
-        all_assessment_item_ids: List[str] = []
-        seen_assessment: set[str] = set()
+        # Insertion-ordered sets: dict keys keep first-seen order
+        course_unit_ids: Dict[str, None] = {}
+        all_assessment_item_ids: Dict[str, None] = {}
 
         matches: List[Dict[str, Any]] = []
+        # Keyed by value: equal ids from different responses are distinct
+        # objects, and str caches its hash, so repeat lookups are cheap
         seen_cur_ids: set[str] = set()
+        # Snapshots still allowed by limit_realisations (None: unlimited)
+        remaining = limit_realisations
+
+        # CUR snapshots are fetched on this pool while later course units
+        # are still being expanded; harvested in submission order
+        pending: List[Tuple[str, Future]] = []
+
+        def harvest() -> None:
+            nonlocal remaining
+            for course_unit_id, future in pending:
+                rec = future.result()
+                if rec is None:
+                    continue
+
+                # Preserve payload courseUnitId if it exists; only fill if missing.
+                if isinstance(rec, dict) and "courseUnitId" not in rec:
+                    rec["courseUnitId"] = course_unit_id
+
+                matches.append(rec)
+                if remaining is not None:
+                    remaining -= 1
+            pending.clear()
+
+        executor = ThreadPoolExecutor(max_workers=self.SNAPSHOT_MAX_WORKERS)
+        try:
+            for picked in selected:
+                course_unit_id = picked.get("id")
+                if not isinstance(course_unit_id, str) or not course_unit_id:
+                    continue
 
-        for picked in selected:
-            course_unit_id = picked.get("id")
-            if not isinstance(course_unit_id, str) or not course_unit_id:
-                continue
-
-            course_unit_ids.append(course_unit_id)
-
-            assessment_item_ids = picked.get("assessmentItemIds") or []
-            if not isinstance(assessment_item_ids, list):
-                assessment_item_ids = []
-            assessment_item_ids = [x for x in assessment_item_ids if isinstance(x, str)]
-
-            # Fallback: if search result does not provide assessmentItemIds, fetch course unit.
-            if not assessment_item_ids:
-                try:
-                    cu = self.client.fetch_course_unit(course_unit_id, timeout=timeout)
-                    index = parse_course_unit_assessment_index(course_unit_id, cu)
-                    assessment_item_ids = index.assessment_item_ids
-                except Exception as e:
-                    logger.warning("Failed fetching assessmentItemIds for %s: %s", course_unit_id, e)
+                course_unit_ids.setdefault(course_unit_id, None)
+
+                assessment_item_ids = picked.get("assessmentItemIds") or []
+                if not isinstance(assessment_item_ids, list):
                     assessment_item_ids = []
+                assessment_item_ids = [x for x in assessment_item_ids if isinstance(x, str)]
 
-            for aid in assessment_item_ids:
-                if aid not in seen_assessment:
-                    seen_assessment.add(aid)
-                    all_assessment_item_ids.append(aid)
+                # Fallback: if search result does not provide assessmentItemIds, fetch course unit.
+                if not assessment_item_ids:
+                    try:
+                        cu = self.client.fetch_course_unit(course_unit_id, timeout=timeout)
+                        index = parse_course_unit_assessment_index(course_unit_id, cu)
+                        assessment_item_ids = index.assessment_item_ids
+                    except Exception as e:
+                        logger.warning("Failed fetching assessmentItemIds for %s: %s", course_unit_id, e)
+                        assessment_item_ids = []
 
-            if not assessment_item_ids:
-                continue
+                all_assessment_item_ids.update(dict.fromkeys(assessment_item_ids))
 
-            cur_ids = extract_historical_realisation_ids_for_assessment_items(
-                sisu=self.client,
-                assessment_item_ids=assessment_item_ids,
-                date_range=date_range,
-            )
+                if not assessment_item_ids:
+                    continue
 
-            if limit_realisations is not None:
-                remaining = limit_realisations - len(matches)
-                if remaining <= 0:
+                # Checked before extraction so a full result skips its requests
+                if remaining is not None and remaining <= 0:
                     break
-                cur_ids = cur_ids[:remaining]
 
-            for cur_id in cur_ids:
-                if cur_id in seen_cur_ids:
-                    continue
-                seen_cur_ids.add(cur_id)
+                cur_ids = extract_historical_realisation_ids_for_assessment_items(
+                    sisu=self.client,
+                    assessment_item_ids=assessment_item_ids,
+                    date_range=date_range,
+                )
 
-                try:
-                    rec = course_api.fetch_course_unit_realisation(cur_id)
-                except Exception as e:
-                    logger.warning("Failed fetching CUR %s: %s", cur_id, e)
-                    continue
+                if remaining is not None:
+                    cur_ids = cur_ids[:remaining]
 
-                # Preserve payload courseUnitId if it exists; only fill if missing.
-                if isinstance(rec, dict) and "courseUnitId" not in rec:
-                    rec["courseUnitId"] = course_unit_id
+                new_cur_ids = [cur_id for cur_id in cur_ids if cur_id not in seen_cur_ids]
+                seen_cur_ids.update(new_cur_ids)
+                pending.extend(
+                    (course_unit_id,
+                     executor.submit(self._fetch_snapshot, course_api, cur_id))
+                    for cur_id in new_cur_ids
+                )
 
-                matches.append(rec)
+                if remaining is not None:
+                    # The limit counts fetched snapshots, so settle them first
+                    harvest()
 
-        # Deduplicate courseUnitIds while preserving order
-        deduped_course_unit_ids: List[str] = []
-        seen_cu: set[str] = set()
-        for cu in course_unit_ids:
-            if cu not in seen_cu:
-                seen_cu.add(cu)
-                deduped_course_unit_ids.append(cu)
+            harvest()
+        except BaseException:
+            # Do not wait for queued snapshot fetches before the error surfaces
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
 
-        status = "ok" if deduped_course_unit_ids else "not_found"
+        status = "ok" if course_unit_ids else "not_found"
 
         return {
             "courseCode": q,
             "status": status,
-            "courseUnitIds": deduped_course_unit_ids,
-            "assessmentItemIds": all_assessment_item_ids,
+            "courseUnitIds": list(course_unit_ids),
+            "assessmentItemIds": list(all_assessment_item_ids),
             "matches": matches,
         }
+
+    @staticmethod
+    def _find_realisation(
+        realisations: List[Dict[str, Any]],
+        offering_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the realisation with the given id, or None"""
+        return next(
+            (r for r in realisations if r.get("id") == offering_id), None)
+
+    @staticmethod
+    def _fetch_snapshot(
+        course_api: AaltoCourseApiClient,
+        cur_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch one CUR payload, logging and returning None on failure"""
+        try:
+            return course_api.fetch_course_unit_realisation(cur_id)
+        except Exception as e:
+            logger.warning("Failed fetching CUR %s: %s", cur_id, e)
+            return None
@@ -0,0 +1,68 @@
+"""
+Unit tests for the AaltoCourseApiClient HTTP client
+
+Tests cover the prepared-request path, the 404 -> None contract and
+how error statuses are reported.
+"""
+
+import json
+from unittest.mock import patch
+import pytest
+import requests
+from sisu_wrapper.aalto_api_client import AaltoCourseApiClient
+from sisu_wrapper.exceptions import SisuHTTPError
+
+
+def _response(status_code, body=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode() if body is not None else b""
+    return response
+
+
+@pytest.fixture
+def course_api(monkeypatch):
+    monkeypatch.setenv(AaltoCourseApiClient.ENV_KEY_NAME, "test-key")
+    with AaltoCourseApiClient() as client:
+        yield client
+
+
+@patch('requests.Session.send')
+def test_fetch_course_unit_realisation_success(mock_send, course_api):
+    """Test that a 200 returns the payload and sends the API key"""
+    mock_send.return_value = _response(200, {"id": "cur-1"})
+
+    assert course_api.fetch_course_unit_realisation("cur-1") == {"id": "cur-1"}
+
+    prepared = mock_send.call_args.args[0]
+    assert prepared.url == (
+        f"{AaltoCourseApiClient.BASE_URL}/courseunitrealisations/cur-1?USER_KEY=test-key"
+    )
+    assert mock_send.call_args.kwargs["timeout"] == AaltoCourseApiClient.DEFAULT_TIMEOUT
+
+
+@patch('requests.Session.send')
+def test_fetch_course_unit_realisation_not_found(mock_send, course_api):
+    """Test that a 404 maps to None instead of an exception"""
+    mock_send.return_value = _response(404)
+
+    assert course_api.fetch_course_unit_realisation("cur-gone") is None
+
+
+@patch('requests.Session.send')
+def test_fetch_course_unit_realisation_server_error(mock_send, course_api):
+    """Test that other error statuses raise SisuHTTPError with the status"""
+    mock_send.return_value = _response(500)
+
+    with pytest.raises(SisuHTTPError) as exc_info:
+        course_api.fetch_course_unit_realisation("cur-1")
+
+    assert exc_info.value.status_code == 500
+
+
+def test_missing_api_key_is_rejected(monkeypatch):
+    """Test that the client refuses to start without an API key"""
+    monkeypatch.delenv(AaltoCourseApiClient.ENV_KEY_NAME, raising=False)
+
+    with pytest.raises(RuntimeError):
+        AaltoCourseApiClient()
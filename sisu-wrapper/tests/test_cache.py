@@ -0,0 +1,88 @@
+"""
+Unit tests for the caching helpers
+
+Tests cover the in-memory TTLCache, the on-disk SqliteCache and how
+SisuClient uses the persistent cache for unfiltered realisation lists.
+"""
+
+from unittest.mock import Mock, patch
+import pytest
+import requests
+from sisu_wrapper import SisuClient
+from sisu_wrapper import cache as cache_module
+from sisu_wrapper.cache import SqliteCache, TTLCache
+from sisu_wrapper.exceptions import SisuHTTPError
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that a lookup protects an entry from the next eviction"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_sqlite_cache_hit_miss_and_reopen(tmp_path):
+    """Test that stored values survive reopening and unknown keys miss"""
+    path = tmp_path / "nested" / "cache.sqlite3"
+    with SqliteCache(str(path), ttl=60) as cache:
+        assert cache.get("k") is None
+        cache.set("k", [{"id": "cur-1"}])
+        assert cache.get("k") == [{"id": "cur-1"}]
+
+    with SqliteCache(str(path), ttl=60) as cache:
+        assert cache.get("k") == [{"id": "cur-1"}]
+        assert cache.get("other") is None
+
+
+def test_sqlite_cache_expires_entries(tmp_path, monkeypatch):
+    """Test that entries older than ttl are treated as missing"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    with SqliteCache(str(tmp_path / "cache.sqlite3"), ttl=60) as cache:
+        cache.set("k", {"v": 1})
+        now[0] += 59
+        assert cache.get("k") == {"v": 1}
+        now[0] += 1
+        assert cache.get("k") is None
+
+
+@patch('requests.Session.get')
+def test_realisations_all_served_from_persistent_cache(mock_get, tmp_path):
+    """Test that unfiltered realisation lists are fetched once per cache"""
+    mock_response = Mock()
+    mock_response.json.return_value = [{"id": "cur-1"}]
+    mock_get.return_value = mock_response
+
+    with SqliteCache(str(tmp_path / "cache.sqlite3"), ttl=60) as cache:
+        first = SisuClient(persistent_cache=cache).fetch_course_unit_realisations_all("ai-1")
+        second = SisuClient(persistent_cache=cache).fetch_course_unit_realisations_all("ai-1")
+
+    assert first == second == [{"id": "cur-1"}]
+    assert mock_get.call_count == 1
+
+
+@patch('requests.Session.get')
+def test_realisations_all_errors_are_not_cached(mock_get, tmp_path):
+    """Test that a failed request leaves nothing in the persistent cache"""
+    error_response = Mock(status_code=503)
+    error_response.raise_for_status.side_effect = requests.HTTPError(
+        response=error_response)
+    ok_response = Mock()
+    ok_response.json.return_value = [{"id": "cur-1"}]
+    mock_get.side_effect = [error_response, ok_response]
+
+    with SqliteCache(str(tmp_path / "cache.sqlite3"), ttl=60) as cache:
+        client = SisuClient(persistent_cache=cache)
+        with pytest.raises(SisuHTTPError):
+            client.fetch_course_unit_realisations_all("ai-1")
+        assert cache.get("course-unit-realisations:ai-1") is None
+
+        assert client.fetch_course_unit_realisations_all("ai-1") == [{"id": "cur-1"}]
+    assert mock_get.call_count == 2
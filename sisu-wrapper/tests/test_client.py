@@ -11,10 +11,15 @@ error handling, and timeout scenarios.
 # - Mock more edge cases (404s, malformed JSON, etc.)
 # - Integration tests with fixtures
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch
 import pytest
 import requests
 from sisu_wrapper import SisuClient, SisuAPIError
+from sisu_wrapper.exceptions import SisuNotFoundError, SisuTimeoutError
 
 
 def test_client_initialization():
@@ -51,3 +56,153 @@ def test_fetch_course_unit_timeout(mock_get):
     client = SisuClient()
     with pytest.raises(SisuAPIError):
         client.fetch_course_unit("test-id")
+
+
+@patch('requests.Session.get')
+def test_fetch_study_events_batches_long_id_lists(mock_get):
+    """
+    Test that long study event id lists are split into batches
+    and the results are concatenated in request order
+    """
+
+    def respond(url, params=None, timeout=None):
+        response = Mock()
+        response.json.return_value = [
+            {"id": event_id} for event_id in params["id"].split(",")
+        ]
+        return response
+
+    mock_get.side_effect = respond
+    ids = [f"event-{i}" for i in range(120)]
+
+    client = SisuClient()
+    result = client.fetch_study_events(ids)
+
+    assert mock_get.call_count == 3
+    assert [record["id"] for record in result] == ids
+
+
+@patch('requests.Session.get')
+def test_fetch_course_unit_is_cached(mock_get):
+    """Test that repeated course unit lookups are served from the cache"""
+    mock_response = Mock()
+    mock_response.json.return_value = {"name": {"en": "Test Course"}}
+    mock_get.return_value = mock_response
+
+    client = SisuClient()
+    first = client.fetch_course_unit("test-id")
+    second = client.fetch_course_unit("test-id")
+
+    assert first is second
+    assert mock_get.call_count == 1
+
+
+@patch('requests.Session.get')
+def test_fetch_course_realisations_is_cached(mock_get):
+    """Test that repeated realisation lookups reuse the cached list"""
+    mock_response = Mock()
+    mock_response.json.return_value = [{"id": "cur-1"}]
+    mock_get.return_value = mock_response
+
+    client = SisuClient()
+    client.fetch_course_realisations("ai-1")
+    client.fetch_course_realisations("ai-1")
+    client.clear_cache()
+    client.fetch_course_realisations("ai-1")
+
+    assert mock_get.call_count == 2
+
+
+def test_client_session_retries_transient_failures():
+    """Test that the owned session retries rate limits and gateway errors"""
+    client = SisuClient()
+    retry = client.session.get_adapter(client.base_url).max_retries
+
+    assert retry.total == SisuClient.MAX_RETRIES
+    assert 429 in retry.status_forcelist
+    assert 404 not in retry.status_forcelist
+
+
+@pytest.fixture
+def sisu_server():
+    """Local HTTP server replaying a status sequence per path"""
+    responses = {}
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            hits[path] = hits.get(path, 0) + 1
+            status = responses[path].pop(0)
+            if status == "drop":
+                self.close_connection = True
+                return  # hang up without sending a response
+            if status == "slow":
+                time.sleep(0.5)
+                status = 200
+            body = json.dumps({"path": path}).encode()
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Retry-After", "3600")
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client gave up (read timeout)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", responses, hits
+    server.shutdown()
+    server.server_close()
+
+
+def _local_client(monkeypatch, base_url, timeout=10):
+    monkeypatch.setattr(SisuClient, "RETRY_BACKOFF", 0)
+    client = SisuClient(base_url=base_url, timeout=timeout)
+    # Route plain HTTP through the same retrying adapter as https://
+    client.session.mount("http://", client.session.get_adapter("https://"))
+    return client
+
+
+def test_client_retries_server_errors_but_not_missing_resources(monkeypatch, sisu_server):
+    """Test that a 503 is retried (ignoring Retry-After) and a 404 is not"""
+    base_url, responses, hits = sisu_server
+    responses["/course-units/flaky"] = [503, 503, 200]
+    responses["/course-units/missing"] = [404, 200]
+    client = _local_client(monkeypatch, base_url)
+
+    started = time.monotonic()
+    assert client.fetch_course_unit("flaky") == {"path": "/course-units/flaky"}
+    assert time.monotonic() - started < 5
+    assert hits["/course-units/flaky"] == 3
+
+    with pytest.raises(SisuNotFoundError):
+        client.fetch_course_unit("missing")
+    assert hits["/course-units/missing"] == 1
+
+
+def test_client_does_not_retry_read_timeouts(monkeypatch, sisu_server):
+    """Test that a read timeout surfaces after a single attempt"""
+    base_url, responses, hits = sisu_server
+    responses["/course-units/slow"] = ["slow", "slow"]
+    client = _local_client(monkeypatch, base_url, timeout=0.1)
+
+    with pytest.raises(SisuTimeoutError):
+        client.fetch_course_unit("slow")
+    assert hits["/course-units/slow"] == 1
+
+
+def test_client_retries_dropped_connections(monkeypatch, sisu_server):
+    """Test that a connection closed without a response is retried"""
+    base_url, responses, hits = sisu_server
+    responses["/course-units/dropped"] = ["drop", 200]
+    client = _local_client(monkeypatch, base_url)
+
+    assert client.fetch_course_unit("dropped") == {"path": "/course-units/dropped"}
+    assert hits["/course-units/dropped"] == 2
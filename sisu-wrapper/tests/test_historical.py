@@ -0,0 +1,263 @@
+"""
+Unit tests for the historical discovery helpers
+
+Tests cover reading course unit ids from courses.json exports and the
+courses.json driver for historical realisation records.
+"""
+
+import io
+import json
+from datetime import date
+from unittest.mock import Mock
+import pytest
+from sisu_wrapper.exceptions import SisuConnectionError, SisuTimeoutError
+from sisu_wrapper.historical import (
+    DateRange,
+    _iter_json_array,
+    fetch_historical_realisations_for_courses_json,
+    read_course_unit_ids_from_courses_json,
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 8])
+def test_iter_json_array_across_buffer_boundaries(chunk_size):
+    """Test that elements split across read chunks are decoded intact"""
+    data = [
+        {"courseUnitId": "cu-1"}, 12345, 1.5, 2e3, -0.25e-2,
+        "a,b]", [], {"x": [1, 2]}, 10,
+    ]
+    f = io.StringIO(" " + json.dumps(data) + "\n")
+
+    assert list(_iter_json_array(f, chunk_size=chunk_size)) == data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 8])
+def test_iter_json_array_numbers_cut_after_dot_or_exponent(chunk_size):
+    """Test that a number cut after '.' or 'e' is not decoded early"""
+    f = io.StringIO("[1.5, 2e3, 10]")
+
+    assert list(_iter_json_array(f, chunk_size=chunk_size)) == [1.5, 2000.0, 10]
+
+
+def test_read_course_unit_ids_dedups_in_order(tmp_path):
+    """Test that duplicate and malformed entries are skipped"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": "cu-2"},
+        {"courseUnitId": "cu-1"},
+        {"courseUnitId": "cu-2"},
+        {"courseUnitId": None},
+        "not-a-course",
+    ]), encoding="utf-8")
+
+    assert read_course_unit_ids_from_courses_json(str(path)) == ["cu-2", "cu-1"]
+
+
+def test_read_course_unit_ids_requires_list(tmp_path):
+    """Test that a non-list courses.json is rejected"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps({"courseUnitId": "cu-1"}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        read_course_unit_ids_from_courses_json(str(path))
+
+
+def test_fetch_historical_realisations_preserves_course_order(tmp_path):
+    """Test that concurrently processed course units keep courses.json order"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": f"cu-{i}"} for i in range(5)
+    ]), encoding="utf-8")
+
+    sisu = Mock()
+    sisu.fetch_course_unit.side_effect = lambda cuid: {
+        "completionMethods": [{"assessmentItemIds": [f"ai-{cuid}"]}]
+    }
+    sisu.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}},
+        {"id": f"old-{aid}", "activityPeriod": {"startDate": "2019-01-10"}},
+    ]
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = lambda rid: {"id": rid}
+
+    out = fetch_historical_realisations_for_courses_json(
+        str(path),
+        sisu,
+        course_api,
+        DateRange(start=date(2022, 9, 1), end=date(2025, 12, 31)),
+        max_workers=4,
+    )
+
+    assert list(out) == [f"cu-{i}" for i in range(5)]
+    assert out["cu-3"] == [{"id": "cur-ai-cu-3"}]
+
+
+def test_fetch_historical_realisations_limits_streamed_course_units(tmp_path):
+    """Test that only the first N course units of the streamed file are processed"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": f"cu-{i}", "assessmentItemIds": [f"ai-{i}"]}
+        for i in range(5)
+    ]), encoding="utf-8")
+
+    sisu = Mock()
+    sisu.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}},
+    ]
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = lambda rid: {"id": rid}
+
+    out = fetch_historical_realisations_for_courses_json(
+        str(path),
+        sisu,
+        course_api,
+        DateRange(start=date(2022, 9, 1), end=date(2025, 12, 31)),
+        limit_course_units=2,
+    )
+
+    assert out == {"cu-0": [{"id": "cur-ai-0"}], "cu-1": [{"id": "cur-ai-1"}]}
+    assert sisu.fetch_course_unit_realisations_all.call_count == 2
+
+
+def test_fetch_historical_realisations_uses_known_assessment_items(tmp_path):
+    """Test that assessmentItemIds from courses.json skip the course unit fetch"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": "cu-1", "assessmentItemIds": ["ai-1"]},
+        {"courseUnitId": "cu-2"},
+    ]), encoding="utf-8")
+
+    sisu = Mock()
+    sisu.fetch_course_unit.return_value = {
+        "completionMethods": [{"assessmentItemIds": ["ai-2"]}]
+    }
+    sisu.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}},
+    ]
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = lambda rid: {"id": rid}
+
+    out = fetch_historical_realisations_for_courses_json(
+        str(path),
+        sisu,
+        course_api,
+        DateRange(start=date(2022, 9, 1), end=date(2025, 12, 31)),
+    )
+
+    assert out == {"cu-1": [{"id": "cur-ai-1"}], "cu-2": [{"id": "cur-ai-2"}]}
+    sisu.fetch_course_unit.assert_called_once_with("cu-2")
+
+
+def test_fetch_historical_realisations_fetches_shared_realisations_once(tmp_path):
+    """Test that a CUR cross-listed under several course units is fetched once"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": "cu-1", "assessmentItemIds": ["ai-1"]},
+        {"courseUnitId": "cu-2", "assessmentItemIds": ["ai-2"]},
+    ]), encoding="utf-8")
+
+    sisu = Mock()
+    sisu.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": "cur-shared", "activityPeriod": {"startDate": "2023-01-10"}},
+        {"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}},
+    ]
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = lambda rid: {"id": rid}
+    out_path = tmp_path / "out.jsonl"
+
+    out = fetch_historical_realisations_for_courses_json(
+        str(path),
+        sisu,
+        course_api,
+        DateRange(start=date(2022, 9, 1), end=date(2025, 12, 31)),
+        output_path=str(out_path),
+    )
+
+    assert out == {"cu-1": 2, "cu-2": 2}
+    assert course_api.fetch_course_unit_realisation.call_count == 3
+    lines = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert {line["course_unit_id"]: [r["id"] for r in line["records"]] for line in lines} == {
+        "cu-1": ["cur-shared", "cur-ai-1"],
+        "cu-2": ["cur-shared", "cur-ai-2"],
+    }
+
+
+def test_fetch_historical_realisations_retries_failed_units_on_rerun(tmp_path):
+    """Test that a failed unit is not written, so the next run retries it"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": "cu-1", "assessmentItemIds": ["ai-1"]},
+        {"courseUnitId": "cu-2", "assessmentItemIds": ["ai-2"]},
+        {"courseUnitId": "cu-3", "assessmentItemIds": ["ai-3"]},
+    ]), encoding="utf-8")
+    out_path = tmp_path / "out.jsonl"
+    date_range = DateRange(start=date(2022, 9, 1), end=date(2025, 12, 31))
+
+    def realisations(aid):
+        if aid == "ai-2":
+            raise SisuTimeoutError("timed out")
+        return [{"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}}]
+
+    def record(rid):
+        if rid == "cur-ai-1":
+            return None  # 404: an empty result, not a failure
+        if rid == "cur-ai-3":
+            raise SisuConnectionError("reset")
+        return {"id": rid}
+
+    sisu = Mock()
+    sisu.fetch_course_unit_realisations_all.side_effect = realisations
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = record
+
+    first = fetch_historical_realisations_for_courses_json(
+        str(path), sisu, course_api, date_range, output_path=str(out_path))
+
+    assert first == {"cu-1": 0}
+
+    sisu.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}}
+    ]
+    course_api.fetch_course_unit_realisation.side_effect = lambda rid: {"id": rid}
+
+    second = fetch_historical_realisations_for_courses_json(
+        str(path), sisu, course_api, date_range, output_path=str(out_path))
+
+    assert second == {"cu-2": 1, "cu-3": 1}
+    lines = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert sorted(line["course_unit_id"] for line in lines) == ["cu-1", "cu-2", "cu-3"]
+
+
+def test_fetch_historical_realisations_streams_units_before_interruption(tmp_path):
+    """Test that units finished before an interruption are already on disk"""
+    path = tmp_path / "courses.json"
+    path.write_text(json.dumps([
+        {"courseUnitId": f"cu-{i}", "assessmentItemIds": [f"ai-{i}"]}
+        for i in range(1, 4)
+    ]), encoding="utf-8")
+    out_path = tmp_path / "out.jsonl"
+
+    def record(rid):
+        if rid == "cur-ai-3":
+            raise KeyboardInterrupt
+        return {"id": rid}
+
+    sisu = Mock()
+    sisu.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": f"cur-{aid}", "activityPeriod": {"startDate": "2023-01-10"}}
+    ]
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = record
+
+    with pytest.raises(KeyboardInterrupt):
+        fetch_historical_realisations_for_courses_json(
+            str(path),
+            sisu,
+            course_api,
+            DateRange(start=date(2022, 9, 1), end=date(2025, 12, 31)),
+            max_workers=1,
+            output_path=str(out_path),
+        )
+
+    lines = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert [line["course_unit_id"] for line in lines] == ["cu-1", "cu-2"]
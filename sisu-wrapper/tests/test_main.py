@@ -0,0 +1,72 @@
+"""
+Unit tests for the resumable crawl CLI helpers
+
+Tests cover the append-only checkpoint log and its compaction into the
+state file, and reading back already written realisations.
+"""
+
+import json
+from sisu_wrapper.__main__ import (
+    append_checkpoint,
+    checkpoint_log_path,
+    load_state,
+    load_written_realisation_ids,
+    save_state,
+)
+
+
+def test_load_state_ignores_torn_last_checkpoint(tmp_path):
+    """Test that a partially written last line falls back to the previous one"""
+    state_path = str(tmp_path / "state.json")
+    with open(checkpoint_log_path(state_path), "a", encoding="utf-8") as log:
+        append_checkpoint(log, {"next_index": 3})
+        append_checkpoint(log, {"next_index": 4})
+        log.write('{"next_index": 5, "last_cou')
+
+    assert load_state(state_path) == {"next_index": 4}
+
+
+def test_load_state_prefers_log_over_state_file(tmp_path):
+    """Test that checkpoints logged after the last compaction win"""
+    state_path = str(tmp_path / "state.json")
+    save_state(state_path, {"next_index": 2})
+    with open(checkpoint_log_path(state_path), "a", encoding="utf-8") as log:
+        append_checkpoint(log, {"next_index": 7})
+
+    assert load_state(state_path) == {"next_index": 7}
+
+
+def test_save_state_compacts_and_removes_log(tmp_path):
+    """Test that compaction writes the state file and drops the log"""
+    state_path = tmp_path / "state.json"
+    log_path = tmp_path / "state.json.log"
+    with open(log_path, "a", encoding="utf-8") as log:
+        append_checkpoint(log, {"next_index": 7})
+
+    save_state(str(state_path), {"next_index": 9, "done": True})
+
+    assert not log_path.exists()
+    assert not (tmp_path / "state.json.tmp").exists()
+    assert json.loads(state_path.read_text(encoding="utf-8")) == {"next_index": 9, "done": True}
+    assert load_state(str(state_path)) == {"next_index": 9, "done": True}
+
+
+def test_load_state_without_files(tmp_path):
+    """Test that a fresh crawl starts from an empty state"""
+    assert load_state(str(tmp_path / "state.json")) == {}
+
+
+def test_load_written_realisation_ids_keys_by_course_unit(tmp_path):
+    """Test that written CURs are keyed by course unit and a torn line is skipped"""
+    out = tmp_path / "out.jsonl"
+    out.write_text(
+        '{"id":"cur-1","courseUnitId":"cu-a"}\n'
+        '{"id":"cur-1","courseUnitId":"cu-b"}\n'
+        '{"id":"cur-2","courseUnitId":"cu-a"}\n'
+        '{"id":"cur-3","cour'
+    )
+
+    assert load_written_realisation_ids(str(out)) == {
+        ("cu-a", "cur-1"), ("cu-b", "cur-1"), ("cu-a", "cur-2"),
+    }
+    assert load_written_realisation_ids(str(tmp_path / "missing.jsonl")) == set()
@@ -0,0 +1,192 @@
+"""
+Unit tests for the SisuService orchestration layer
+
+Tests use a mocked SisuClient to check how API calls are combined
+and how raw responses are turned into domain objects.
+"""
+
+from unittest.mock import Mock
+from sisu_wrapper import SisuService
+from sisu_wrapper.exceptions import SisuHTTPError
+
+
+def _event(event_id, start):
+    return {
+        "id": event_id,
+        "events": [{"start": start, "end": start.replace("10:", "12:")}],
+    }
+
+
+def test_parse_study_groups_fetches_events_once_per_group_set():
+    """Test that subgroup events are fetched in one request and split by id"""
+    client = Mock()
+    client.fetch_study_events.return_value = [
+        _event("ev-1", "2026-01-12T10:15:00"),
+        _event("ev-2", "2026-01-13T10:15:00"),
+    ]
+    service = SisuService(client)
+
+    groups = service._parse_study_groups({
+        "name": {"en": "Exercise"},
+        "studySubGroups": [
+            {"id": "sg-1", "name": {"en": "H01"}, "studyEventIds": ["ev-1"]},
+            {"id": "sg-2", "name": {"en": "H02"}, "studyEventIds": ["ev-2"]},
+            {"id": "sg-3", "name": {"en": "H03"}, "studyEventIds": []},
+        ],
+    })
+
+    client.fetch_study_events.assert_called_once_with(["ev-1", "ev-2"])
+    assert [g.name for g in groups] == ["H01", "H02"]
+    assert groups[1].study_events[0].start == "2026-01-13T10:15:00"
+
+
+def test_fetch_course_offerings_batch_keeps_order_and_isolates_failures():
+    """Test that concurrent batch results follow request order, failures as None"""
+    client = Mock()
+
+    def fetch_course_unit(course_unit_id):
+        if course_unit_id == "unit-bad":
+            raise SisuHTTPError("boom", status_code=500)
+        return {"name": {"en": course_unit_id}, "completionMethods": []}
+
+    client.fetch_course_unit.side_effect = fetch_course_unit
+    service = SisuService(client)
+    requests = [("unit-2", "o-2"), ("unit-bad", "o-x"), ("unit-1", "o-1")]
+
+    results = service.fetch_course_offerings_batch(requests)
+
+    assert list(results) == requests
+    assert results[("unit-bad", "o-x")] is None
+    assert results[("unit-1", "o-1")].name == "unit-1"
+
+
+def test_fetch_course_offering_is_cached_per_service():
+    """Test that a repeated offering lookup is served from the service cache"""
+    client = Mock()
+    client.fetch_course_unit.return_value = {
+        "name": {"en": "Course"}, "completionMethods": []
+    }
+    service = SisuService(client)
+
+    first = service.fetch_course_offering("unit-1", "o-1")
+    second = service.fetch_course_offering("unit-1", "o-1")
+
+    assert first is second
+    client.fetch_course_unit.assert_called_once_with("unit-1")
+    assert SisuService(client).fetch_course_offering("unit-1", "o-1") is not first
+
+
+def test_resolve_course_snapshots_fetches_curs_in_order():
+    """Test that concurrently fetched CURs keep order and skip failures"""
+    client = Mock()
+    client.search_course_units.return_value = {"searchResults": [
+        {"id": "cu-1", "code": "CS-A1110", "assessmentItemIds": ["ai-1"]},
+    ]}
+    client.fetch_course_unit_realisations_all.return_value = [
+        {"id": f"cur-{i}", "activityPeriod": {"startDate": "2023-01-10"}}
+        for i in range(4)
+    ]
+    course_api = Mock()
+
+    def fetch_cur(cur_id):
+        if cur_id == "cur-2":
+            raise RuntimeError("boom")
+        return {"id": cur_id}
+
+    course_api.fetch_course_unit_realisation.side_effect = fetch_cur
+    service = SisuService(client)
+
+    out = service.resolve_course_snapshots_by_code("cs-a1110", course_api)
+
+    assert out["status"] == "ok"
+    assert [m["id"] for m in out["matches"]] == ["cur-0", "cur-1", "cur-3"]
+    assert out["matches"][0]["courseUnitId"] == "cu-1"
+
+
+def test_fetch_course_offering_fetches_events_once_per_offering():
+    """Test that events of all group sets are fetched in a single call"""
+    client = Mock()
+    client.fetch_course_unit.return_value = {
+        "name": {"en": "Course"},
+        "completionMethods": [{"assessmentItemIds": ["ai-1"]}],
+    }
+    client.fetch_course_realisations.return_value = [{
+        "id": "o-1",
+        "studyGroupSets": [
+            {"name": {"en": "Lecture"}, "studySubGroups": [
+                {"id": "sg-1", "name": {"en": "L01"}, "studyEventIds": ["ev-1"]},
+            ]},
+            {"name": {"en": "Exercise"}, "studySubGroups": [
+                {"id": "sg-2", "name": {"en": "H01"}, "studyEventIds": ["ev-2"]},
+            ]},
+        ],
+    }]
+    client.fetch_study_events.return_value = [
+        _event("ev-1", "2026-01-12T10:15:00"),
+        _event("ev-2", "2026-01-13T10:15:00"),
+    ]
+    service = SisuService(client)
+
+    offering = service.fetch_course_offering("unit-1", "o-1")
+
+    client.fetch_study_events.assert_called_once_with(["ev-1", "ev-2"])
+    assert [(g.type, g.name) for g in offering.study_groups] == [
+        ("Lecture", "L01"), ("Exercise", "H01")
+    ]
+
+
+def test_fetch_course_offering_stops_at_first_matching_realisation():
+    """Test that remaining assessment items are skipped once the offering is found"""
+    client = Mock()
+    client.fetch_course_unit.return_value = {
+        "name": {"en": "Course"},
+        "completionMethods": [{"assessmentItemIds": [f"ai-{i}" for i in range(20)]}],
+    }
+    client.fetch_course_realisations.return_value = [
+        {"id": "other"},
+        {"id": "o-1", "studyGroupSets": []},
+    ]
+    service = SisuService(client, max_workers=1)
+
+    offering = service.fetch_course_offering("unit-1", "o-1")
+
+    assert offering.study_groups == []
+    assert client.fetch_course_realisations.call_count < 20
+
+
+def test_fetch_study_groups_batch_fetches_duplicate_requests_once():
+    """Test that repeated (unit, offering) pairs share one fetch"""
+    client = Mock()
+    client.fetch_course_unit.return_value = {
+        "name": {"en": "Course"}, "completionMethods": []
+    }
+    service = SisuService(client)
+    service._offering_cache.get = Mock(return_value=None)
+
+    results = service.fetch_study_groups_batch([("unit-1", "o-1"), ("unit-1", "o-1")])
+
+    assert results == {("unit-1", "o-1"): []}
+    client.fetch_course_unit.assert_called_once_with("unit-1")
+
+
+def test_resolve_course_snapshots_skips_extraction_once_limit_is_reached():
+    """Test that later course units are not expanded after the limit is met"""
+    client = Mock()
+    client.search_course_units.return_value = {"searchResults": [
+        {"id": "cu-1", "code": "CS-A1110", "assessmentItemIds": ["ai-1"]},
+        {"id": "cu-2", "code": "CS-A1110", "assessmentItemIds": ["ai-2"]},
+    ]}
+    client.fetch_course_unit_realisations_all.side_effect = lambda aid: [
+        {"id": f"cur-{aid}-{i}", "activityPeriod": {"startDate": "2023-01-10"}}
+        for i in range(3)
+    ]
+    course_api = Mock()
+    course_api.fetch_course_unit_realisation.side_effect = lambda rid: {"id": rid}
+    service = SisuService(client)
+
+    out = service.resolve_course_snapshots_by_code(
+        "CS-A1110", course_api, limit_realisations=2)
+
+    assert [m["id"] for m in out["matches"]] == ["cur-ai-1-0", "cur-ai-1-1"]
+    assert out["courseUnitIds"] == ["cu-1", "cu-2"]
+    client.fetch_course_unit_realisations_all.assert_called_once_with("ai-1")